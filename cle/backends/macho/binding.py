@@ -64,6 +64,32 @@ def read_uleb(blob: bytes, offset: int) -> tuple[int, int]:
     return result, index - offset
 
 
+_ULEB_WORD = struct.Struct("<Q")
+_ULEB_CONT_MASK = 0x8080808080808080
+
+
+def decode_uleb_swar(blob: bytes, offset: int) -> tuple[int, int]:
+    """
+    Reads a number encoded as uleb128 by decoding up to 8 bytes at once.
+
+    The blob must be padded with at least 8 trailing bytes beyond the last value, so the 8 byte load never reads
+    out of bounds. Values longer than 8 bytes fall back to read_uleb.
+    """
+    word = _ULEB_WORD.unpack_from(blob, offset)[0]
+    mask = ~word & _ULEB_CONT_MASK
+    if mask == 0:
+        return read_uleb(blob, offset)
+    # the lowest clear continuation bit marks the last byte of the value
+    length = (mask & -mask).bit_length() >> 3
+    word &= (1 << (length << 3)) - 1
+    # pack the 7 bit groups together, doubling the packed width on every step
+    word &= 0x7F7F7F7F7F7F7F7F
+    word = (word & 0x007F007F007F007F) | ((word & 0x7F007F007F007F00) >> 1)
+    word = (word & 0x00003FFF00003FFF) | ((word & 0x3FFF00003FFF0000) >> 2)
+    word = (word & 0x000000000FFFFFFF) | ((word & 0x0FFFFFFF00000000) >> 4)
+    return word, length
+
+
 def read_sleb(blob, offset):
     """Reads a number encoded as sleb128"""
     result = 0
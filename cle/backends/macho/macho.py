@@ -2,21 +2,29 @@
 # Contributed December 2016 by Fraunhofer SIT (https://www.sit.fraunhofer.de/en/).
 from __future__ import annotations
 
+import bisect
 import ctypes
+import itertools
 import logging
+import mmap
+import operator
 import struct
 import sys
 import typing
 from collections import defaultdict
-from io import BufferedReader, BytesIO
-from os import SEEK_CUR, SEEK_SET
+from io import BufferedReader
 from typing import Union
 
 import archinfo
 from sortedcontainers import SortedKeyList
 
 from cle.backends.backend import AT, Backend, register_backend
-from cle.backends.macho.binding import BindingHelper, MachOPointerRelocation, MachOSymbolRelocation, read_uleb
+from cle.backends.macho.binding import (
+    BindingHelper,
+    MachOPointerRelocation,
+    MachOSymbolRelocation,
+    decode_uleb_swar,
+)
 from cle.backends.regions import Regions
 from cle.errors import CLECompatibilityError, CLEInvalidBinaryError, CLEOperationError
 
@@ -50,29 +58,262 @@ class SymbolList(SortedKeyList):
     """
 
     _symbol_cache: defaultdict[tuple[str, int], list[AbstractMachOSymbol]]
+    _symbol_cache_nostab: defaultdict[tuple[str, int], list[AbstractMachOSymbol]]
+    version: int  # bumped on every change, so indexes derived from the list can tell whether they are stale
 
     def __init__(self, **kwargs):
-        super().__init__(**kwargs)
+        self.version = 0
         self._symbol_cache = defaultdict(list)
+        # the same without stabs, so lookups that exclude them don't have to filter on every call
+        self._symbol_cache_nostab = defaultdict(list)
+        super().__init__(**kwargs)
+
+    def _cache_symbol(self, value: AbstractMachOSymbol):
+        key = (value.name, value.library_ordinal)
+        self._symbol_cache[key].append(value)
+        if not value.is_stab:
+            self._symbol_cache_nostab[key].append(value)
 
     def add(self, value: AbstractMachOSymbol):
         super().add(value)
-        self._symbol_cache[
-            (
-                value.name,
-                value.library_ordinal,
-            )
-        ].append(value)
+        self._cache_symbol(value)
+        self.version += 1
+
+    def update(self, iterable):
+        # the cache is filled in the same pass that inserts or collects the values
+        if self:
+            # SortedKeyList.update goes through self.add for small batches, which would cache every value a second
+            # time, and through self._clear for large ones. Inserting with the base class add avoids both.
+            for value in iterable:
+                super().add(value)
+                self._cache_symbol(value)
+        else:
+            # an empty list is filled in bulk, without calling add or _clear
+            values = []
+            for value in iterable:
+                values.append(value)
+                self._cache_symbol(value)
+            super().update(values)
+        self.version += 1
+
+    # sortedcontainers refills the list through _update, e.g. when deleting a slice
+    _update = update
+
+    # all removals in sortedcontainers go through _delete or _clear
+    def _delete(self, pos, idx):
+        value = self._lists[pos][idx]
+        super()._delete(pos, idx)
+        key = (value.name, value.library_ordinal)
+        self._symbol_cache[key].remove(value)
+        if not value.is_stab:
+            self._symbol_cache_nostab[key].remove(value)
+        self.version += 1
+
+    def _clear(self):
+        super()._clear()
+        self._symbol_cache = defaultdict(list)
+        self._symbol_cache_nostab = defaultdict(list)
+        self.version += 1
+
+    clear = _clear
 
     def get_by_name_and_ordinal(self, name: str, ordinal: int, include_stab=False) -> list[AbstractMachOSymbol]:
         if include_stab:
             return self._symbol_cache[(name, ordinal)]
         else:
-            return [symbol for symbol in self._symbol_cache[(name, ordinal)] if not symbol.is_stab]
+            return list(self._symbol_cache_nostab.get((name, ordinal), ()))
 
 
 # pylint: enable =abstract-method
 
+_SymTuple = tuple[int, str, AbstractMachOSymbol]  # (len(name), name, symbol)
+
+
+class _SymbolIndex:
+    """
+    Lookup tables for the name and address lookups of MachO, derived from one version of its SymbolList. All of them
+    keep the address order of the symbols, like a linear scan would. MachO replaces the whole object when the symbols
+    change, the views that only some lookups need are built when they are first asked for.
+    """
+
+    # Without the name dicts, this many exact lookups after each change scan the names in address order before the
+    # name sorted view is built. Measured on tables of 64 to 50000 symbols, sorting cost as much as 15 to 25 scans, so
+    # a few lookups between changes never pay for the sort and many lookups pay at most about twice its cost.
+    SCAN_LOOKUPS = 16
+
+    __slots__ = (
+        "symbols",
+        "version",
+        "name_index",
+        "name_index_nostab",
+        "sym_tuples",
+        "sym_tuples_nostab",
+        "is_stab",
+        "_sorted_names",
+        "_names",
+        "_scans_left",
+        "_casefolded_names",
+        "_sorted_casefolded_names",
+        "_joined_names",
+        "_by_address",
+        "last_fuzzy_key",
+        "last_fuzzy_result",
+    )
+
+    def __init__(self, symbols: SymbolList, use_name_index: bool):
+        self.symbols = symbols
+        self.version = symbols.version
+        # name -> symbols, with and without stabs. None with symbol_name_index=False, lookups search lists of names
+        # instead
+        self.name_index: dict[str, list[AbstractMachOSymbol]] | None = None
+        self.name_index_nostab: dict[str, list[AbstractMachOSymbol]] | None = None
+        # for fuzzy lookups
+        self.sym_tuples: list[_SymTuple] = []
+        self.sym_tuples_nostab: list[_SymTuple] = []
+        # 1 for every stab in symbols, in the same order, so filters don't have to ask the symbol
+        self.is_stab = bytearray()
+        # names, symbols, stab flags and address order positions, sorted by name, see sorted_names
+        self._sorted_names: tuple[list[str], list[AbstractMachOSymbol], bytearray, list[int]] | None = None
+        # names in address order and the exact lookups that may still scan them, see names_to_scan
+        self._names: list[str] | None = None
+        self._scans_left = self.SCAN_LOOKUPS
+        # include_stab -> sym tuples and name index with casefolded names, see casefolded_names
+        self._casefolded_names: dict[bool, tuple[list[_SymTuple], dict[str, list[AbstractMachOSymbol]] | None]] = {}
+        # include_stab -> casefolded names and their symbols, sorted by name, see sorted_casefolded_names
+        self._sorted_casefolded_names: dict[bool, tuple[list[str], list[AbstractMachOSymbol]]] = {}
+        # (include_stab, case_insensitive) -> (NUL joined names, start offset of each name, sym tuples), see
+        # joined_names
+        self._joined_names: dict[tuple[bool, bool], tuple[str, list[int], list[_SymTuple]]] = {}
+        # symbol by address, bind xref and symbol stub, see by_address
+        self._by_address: dict[int, AbstractMachOSymbol] | None = None
+        # the last fuzzy get_symbol query as (name, include_stab, case_insensitive) and its result
+        self.last_fuzzy_key: tuple[str, bool, bool] | None = None
+        self.last_fuzzy_result: list[AbstractMachOSymbol] | None = None
+
+        index = {}
+        index_nostab = {}
+        # bound methods as locals, this loop runs once per symbol
+        add_tuple = self.sym_tuples.append
+        add_tuple_nostab = self.sym_tuples_nostab.append
+        add_is_stab = self.is_stab.append
+        index_setdefault = index.setdefault
+        index_nostab_setdefault = index_nostab.setdefault
+        for sym in symbols:
+            name = sym.name
+            entry = (len(name), name, sym)
+            add_tuple(entry)
+            if use_name_index:
+                index_setdefault(name, []).append(sym)
+            if sym.is_stab:
+                add_is_stab(1)
+            else:
+                add_is_stab(0)
+                add_tuple_nostab(entry)
+                if use_name_index:
+                    index_nostab_setdefault(name, []).append(sym)
+        if use_name_index:
+            self.name_index = index
+            self.name_index_nostab = index_nostab
+
+    def sorted_names(self) -> tuple[list[str], list[AbstractMachOSymbol], bytearray, list[int]]:
+        """
+        Returns the names, symbols, stab flags and address order positions of all symbols, sorted by name. The sort is
+        stable so symbols with the same name stay in address order.
+        """
+        if self._sorted_names is None:
+            sym_tuples = self.sym_tuples
+            order = sorted(range(len(sym_tuples)), key=lambda i: sym_tuples[i][1])
+            self._sorted_names = (
+                [sym_tuples[i][1] for i in order],
+                [sym_tuples[i][2] for i in order],
+                bytearray(map(self.is_stab.__getitem__, order)),
+                order,
+            )
+        return self._sorted_names
+
+    def names_to_scan(self) -> list[str] | None:
+        """
+        Returns the names in address order for an exact lookup that scans them, or None once bisecting the name sorted
+        view is cheaper
+        """
+        if self._sorted_names is not None or not self._scans_left:
+            return None
+        self._scans_left -= 1
+        if self._names is None:
+            self._names = [sym_name for _, sym_name, _ in self.sym_tuples]
+        return self._names
+
+    def casefolded_names(
+        self, include_stab: bool
+    ) -> tuple[list[_SymTuple], dict[str, list[AbstractMachOSymbol]] | None]:
+        """
+        Returns sym tuples and a name index like the ones for exact lookups, but with casefolded names. Like the name
+        index, the casefolded one is None with symbol_name_index=False, see sorted_casefolded_names.
+        """
+        casefolded = self._casefolded_names.get(include_stab)
+        if casefolded is None:
+            sym_tuples = []
+            index = {} if self.name_index is not None else None
+            for _, sym_name, sym in self.sym_tuples if include_stab else self.sym_tuples_nostab:
+                # names without uppercase letters fold to themselves, interning shares the original string then
+                folded = sys.intern(sym_name.casefold())
+                sym_tuples.append((len(folded), folded, sym))
+                if index is not None:
+                    index.setdefault(folded, []).append(sym)
+            casefolded = (sym_tuples, index)
+            self._casefolded_names[include_stab] = casefolded
+        return casefolded
+
+    def sorted_casefolded_names(self, include_stab: bool) -> tuple[list[str], list[AbstractMachOSymbol]]:
+        """
+        Returns the casefolded names and their symbols, sorted by name. The sort is stable so symbols with the same
+        name stay in address order.
+        """
+        sorted_names = self._sorted_casefolded_names.get(include_stab)
+        if sorted_names is None:
+            sym_tuples = sorted(self.casefolded_names(include_stab)[0], key=operator.itemgetter(1))
+            sorted_names = ([sym_name for _, sym_name, _ in sym_tuples], [sym for _, _, sym in sym_tuples])
+            self._sorted_casefolded_names[include_stab] = sorted_names
+        return sorted_names
+
+    def joined_names(self, include_stab: bool, case_insensitive: bool) -> tuple[str, list[int], list[_SymTuple]]:
+        """
+        Returns all names joined into one NUL separated string, the start offset of each name in it followed by the
+        end of the string, and the sym tuples the names come from
+        """
+        joined = self._joined_names.get((include_stab, case_insensitive))
+        if joined is None:
+            if case_insensitive:
+                sym_tuples = self.casefolded_names(include_stab)[0]
+            else:
+                sym_tuples = self.sym_tuples if include_stab else self.sym_tuples_nostab
+            starts = []
+            pos = 0
+            for sym_len, _, _ in sym_tuples:
+                starts.append(pos)
+                pos += sym_len + 1
+            # sentinel, so the start of the next name can always be looked up
+            starts.append(pos)
+            joined = ("\0".join(sym_name for _, sym_name, _ in sym_tuples) + "\0", starts, sym_tuples)
+            self._joined_names[(include_stab, case_insensitive)] = joined
+        return joined
+
+    def by_address(self) -> dict[int, AbstractMachOSymbol]:
+        """
+        Returns the symbol for each relative address, bind xref and symbol stub, the first symbol in address order wins
+        """
+        if self._by_address is None:
+            index = {}
+            index_setdefault = index.setdefault
+            for sym in self.symbols:
+                index_setdefault(sym.relative_addr, sym)
+                for xref in sym.bind_xrefs:
+                    index_setdefault(xref, sym)
+                for stub in sym.symbol_stubs:
+                    index_setdefault(stub, sym)
+            self._by_address = index
+        return self._by_address
+
 
 class MachO(Backend):
     """
@@ -87,6 +328,11 @@ class MachO(Backend):
     - Rebasing in dyld is implemented by adding a small slide to addresses inside the binary, instead of
       changing the base address of the binary. Consequently, the addresses are absolute rather than relative.
       CLE requires relative addresses, leading to numerous `AT.from_lva().to_rva()` calls in this backend.
+
+    Useful backend options:
+
+    - ``symbol_name_index``: Build dicts from names to symbols for exact name lookups, enabled by default. Set it to
+      False to save their memory on binaries with many symbols, lookups then search lists of names instead.
     """
 
     is_default = True  # Tell CLE to automatically consider using the MachO backend
@@ -95,16 +341,26 @@ class MachO(Backend):
     MH_CIGAM_64 = 0xCFFAEDFE
     MH_MAGIC = 0xFEEDFACE
     MH_CIGAM = 0xCEFAEDFE
+    # maps the magic, read as a little-endian integer, to the struct byteorder of the binary
+    _MAGIC_TO_BYTEORDER = {MH_MAGIC_64: "<", MH_MAGIC: "<", MH_CIGAM_64: ">", MH_CIGAM: ">"}
+    # the first 7 fields of mach_header(_64) for each byteorder, the 64 bit header only appends a reserved field
+    _MACH_HEADER_STRUCTS = {"<": struct.Struct("<7I"), ">": struct.Struct(">7I")}
+    # get_symbols_matching stops using str.find for a pattern once it matched more than one in this many names. Every
+    # hit costs a bisect and a new search on top of the search itself, at about this rate testing each remaining name
+    # directly gets cheaper.
+    _FIND_MAX_HIT_RATIO = 8
     ncmds: int
     sizeofcmds: int
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, symbol_name_index: bool = True, **kwargs):
         log.warning("The Mach-O backend is not well-supported. Good luck!")
 
         super().__init__(*args, **kwargs)
+        self.set_load_args(symbol_name_index=symbol_name_index)
         self.symbols = SymbolList(key=self._get_symbol_relative_addr)
 
         self.struct_byteorder = None  # holds byteorder for struct.unpack(...)
+        self._structs: dict[str, struct.Struct] = {}  # compiled structs by format, see _compiled_struct
         self._mapped_base = None  # temporary holder für mapped base derived via loading
         self.cputype = None
         self.cpusubtype = None
@@ -112,6 +368,7 @@ class MachO(Backend):
         self.flags = None  # binary flags
         self.imported_libraries = ["Self"]  # ordinal 0 = SELF_LIBRARY_ORDINAL
         self.sections_by_ordinal = [None]  # ordinal 0 = None == Self
+        self._segments_by_name: dict[str, MachOSegment] = {}  # first segment with each name, filled by _load_segment
         self.exports_by_name = {}  # note exports is currently a raw and unprocessed datastructure.
         # If we intend to use it we must first upgrade it to a class or somesuch
         self.entryoff = None
@@ -132,8 +389,17 @@ class MachO(Backend):
         self.strtab: bytes | None = None
         self._indexed_strtab: dict[int, bytes] | None = None
         self._dyld_chained_fixups_offset: int | None = None
+        self._lc_blob: bytes | None = None  # raw load commands while _parse_load_commands runs
+        self._lc_offset: int = 0  # file offset of the first load command
+        # read-only mapping of the whole file while parsing, or None if the stream has no file descriptor
+        self._file_map: mmap.mmap | None = None
         self._dyld_imports: list[AbstractMachOSymbol] = []
 
+        # Lookup tables derived from self.symbols, see _get_symbol_index
+        # With symbol_name_index=False, exact lookups search lists of names instead of using name dicts
+        self._use_name_index = symbol_name_index
+        self._symbol_index: _SymbolIndex | None = None
+
         # For some analysis the insertion order of the symbols is relevant and needs to be kept.
         # This is has to be separate from self.symbols because the latter is sorted by address
         self._ordered_symbols: list[AbstractMachOSymbol] = []
@@ -141,16 +407,27 @@ class MachO(Backend):
         # The minimum version encoded by the LC_BUILD_VERSION command
         self._minimum_version: tuple[int, int, int] | None = None
 
-        # Begin parsing the file
+        # Begin parsing the file. The mapping is only used while parsing, release it even if parsing fails
+        self._file_map = self._map_stream(self._binary_stream)
+        try:
+            self._parse()
+        finally:
+            if self._file_map is not None:
+                self._file_map.close()
+                self._file_map = None
+
+    def _parse(self):
         try:
             binary_file = self._binary_stream
             # get magic value and determine endianness
-            self.struct_byteorder = self._detect_byteorder(struct.unpack("=I", binary_file.read(4))[0])
+            self.struct_byteorder = self._detect_byteorder(struct.unpack("<I", binary_file.read(4))[0])
 
             # parse the mach header:
             # (ignore all irrelevant fields)
-            (_, self.cputype, self.cpusubtype, self.filetype, self.ncmds, self.sizeofcmds, self.flags) = self._unpack(
-                "7I", binary_file, 0, 28
+            header_struct = self._MACH_HEADER_STRUCTS[self.struct_byteorder]
+            header = self._file_map if self._file_map is not None else self._read(binary_file, 0, header_struct.size)
+            (_, self.cputype, self.cpusubtype, self.filetype, self.ncmds, self.sizeofcmds, self.flags) = (
+                header_struct.unpack_from(header, 0)
             )
 
             # Libraries are always implicitly PIC
@@ -254,18 +531,21 @@ class MachO(Backend):
         return True
 
     def _parse_load_commands(self, lc_offset):
-        # Possible optimization: Remove all unecessary calls to seek()
         # Load commands have a common structure: First 4 bytes identify the command by a magic number
         # second 4 bytes determine the commands size. Everything after this generic "header" is command-specific
         # this makes parsing the commands easy.
         # The documentation for Mach-O is at
         # http://opensource.apple.com//source/xnu/xnu-1228.9.59/EXTERNAL_HEADERS/mach-o/loader.h
         binary_file = self._binary_stream
+        # The size of all load commands is known from the header, so they are read once and
+        # the fixed-size command structures are unpacked from memory with _unpack_lc
+        self._lc_offset = lc_offset
+        self._lc_blob = self._read(binary_file, lc_offset, self.sizeofcmds)
         count = 0
         offset = lc_offset
         while count < self.ncmds and (offset - lc_offset) < self.sizeofcmds:
             count += 1
-            (cmd, size) = self._unpack("II", binary_file, offset, 8)
+            (cmd, size) = self._unpack_lc("II", offset)
 
             # check for segments that interest us
             if cmd in [LC.LC_SEGMENT, LC.LC_SEGMENT_64]:  # LC_SEGMENT,LC_SEGMENT_64
@@ -299,11 +579,12 @@ class MachO(Backend):
                 # self._assert_unencrypted(binary_file, offset)
             elif cmd in [LC.LC_DYLD_CHAINED_FIXUPS]:
                 log.info("Found LC_DYLD_CHAINED_FIXUPS @ %#x", offset)
-                (_, _, dataoff, datasize) = self._unpack("4I", binary_file, offset, 16)
+                (dataoff,) = self._unpack_lc("I", offset + 8)
                 self._dyld_chained_fixups_offset: int = dataoff
             elif cmd in [LC.LC_BUILD_VERSION]:
                 log.info("Found LC_BUILD_VERSION @ %#x", offset)
-                (_, _, _platform, minos, _sdk, _ntools) = self._unpack("6I", binary_file, offset, 6 * 4)
+                # build_version_command: cmd, cmdsize, platform, minos, sdk, ntools
+                (minos,) = self._unpack_lc("I", offset + 12)
                 patch = (minos >> (8 * 0)) & 0xFF
                 minor = (minos >> (8 * 1)) & 0xFF
                 major = (minos >> (8 * 2)) & 0xFFFF
@@ -311,7 +592,7 @@ class MachO(Backend):
                 log.info("Found minimum version %s", ".".join([str(i) for i in self._minimum_version]))
             elif cmd in [LC.LC_DYLD_EXPORTS_TRIE]:
                 log.info("Found LC_DYLD_EXPORTS_TRIE @ %#x", offset)
-                (_, _, dataoff, datasize) = self._unpack("4I", binary_file, offset, 16)
+                (dataoff, datasize) = self._unpack_lc("2I", offset + 8)
                 self.export_blob = self._read(binary_file, dataoff, datasize)
             elif cmd in [LC.LC_DYSYMTAB]:
                 # TODO: This probably relevant for library loading and symbols, but it isn't clear how yet
@@ -325,6 +606,9 @@ class MachO(Backend):
             # update bookkeeping
             offset += size
 
+        # the commands are parsed, nothing reads the raw blob after this
+        self._lc_blob = None
+
         # Assertion to catch malformed binaries - YES this is needed!
         if count < self.ncmds or (offset - lc_offset) < self.sizeofcmds:
             raise CLEInvalidBinaryError(
@@ -334,16 +618,9 @@ class MachO(Backend):
     @classmethod
     def is_compatible(cls, stream):
         stream.seek(0)
-        identstring = stream.read(0x5)
+        identstring = stream.read(0x4)
         stream.seek(0)
-        if (
-            identstring.startswith(struct.pack("I", MachO.MH_MAGIC_64))
-            or identstring.startswith(struct.pack("I", MachO.MH_CIGAM_64))
-            or identstring.startswith(struct.pack("I", MachO.MH_MAGIC))
-            or identstring.startswith(struct.pack("I", MachO.MH_CIGAM))
-        ):
-            return True
-        return False
+        return len(identstring) == 4 and int.from_bytes(identstring, "little") in cls._MAGIC_TO_BYTEORDER
 
     def is_thumb_interworking(self, address):
         """Returns true if the given address is a THUMB interworking address"""
@@ -363,11 +640,12 @@ class MachO(Backend):
 
         # factoring out common code
         def parse_mod_funcs_internal(s, target):
-            for i in range(s.vaddr, s.vaddr + s.memsize, size):
-                rel_address = AT.from_lva(i, self).to_rva()
-                addr = self._unpack_with_byteorder(fmt, self.memory.load(rel_address, size))[0]
-                log.debug("Addr: %#x", addr)
-                target.append(addr)
+            # load the whole pointer table at once and unpack it with a single format string
+            data = self.memory.load(AT.from_lva(s.vaddr, self).to_rva(), s.memsize)
+            count = len(data) // size
+            addrs = self._unpack_with_byteorder(f"{count}{fmt}", data[: count * size])
+            log.debug("Found %d pointers in %s", count, s.sectname)
+            target.extend(addrs)
 
         for seg in self.segments:
             seg: MachOSection | MachOSegment
@@ -382,11 +660,7 @@ class MachO(Backend):
         log.debug("Done parsing module init/term function pointers")
 
     def find_segment_by_name(self, name):
-        for s in self.segments:
-            s: MachOSection | MachOSegment
-            if s.segname == name:
-                return s
-        return None
+        return self._segments_by_name.get(name)
 
     def _resolve_entry(self):
         if self.entryoff:
@@ -398,55 +672,73 @@ class MachO(Backend):
             self._entry = 0
 
     @staticmethod
-    def _read(fp: BufferedReader, offset: int, size: int) -> bytes:
+    def _map_stream(stream) -> mmap.mmap | None:
+        """
+        Maps the file behind stream into memory, so reads during parsing are slices instead of seek() and read() calls
+        :return: a read-only mmap, or None if the stream isn't backed by a file that can be mapped
+        """
+        try:
+            fileno = stream.fileno()
+        except (AttributeError, OSError):  # io.UnsupportedOperation is an OSError
+            return None
+        try:
+            return mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):  # e.g. empty files or pipes
+            return None
+
+    def _read(self, fp: BufferedReader, offset: int, size: int) -> bytes:
         """
         Simple read abstraction, reads size bytes from offset in file
         :param offset: Offset to seek() to
         :param size: number of bytes to be read
         :return: string of bytes or "" for EOF
         """
+        if self._file_map is not None and fp is self._binary_stream:
+            return self._file_map[offset : offset + size]
         fp.seek(offset)
         return fp.read(size)
 
+    def _compiled_struct(self, fmt: str) -> struct.Struct:
+        """
+        Returns a struct.Struct for self.struct_byteorder+fmt, compiling every format only once
+        """
+        try:
+            return self._structs[fmt]
+        except KeyError:
+            compiled = self._structs[fmt] = struct.Struct(self.struct_byteorder + fmt)
+            return compiled
+
     def _unpack_with_byteorder(self, fmt, data) -> tuple[typing.Any, ...]:
         """
         Appends self.struct_byteorder before fmt to ensure usage of correct byteorder
         :return: struct.unpack(self.struct_byteorder+fmt,input)
         """
-        return struct.unpack(self.struct_byteorder + fmt, data)
+        return self._compiled_struct(fmt).unpack(data)
 
     def _unpack(self, fmt: str, fp: BufferedReader, offset: FilePointer, size: int) -> tuple[typing.Any, ...]:
         """Convenience"""
+        if self._file_map is not None and fp is self._binary_stream:
+            return self._compiled_struct(fmt).unpack_from(self._file_map, offset)
         return self._unpack_with_byteorder(fmt, self._read(fp, offset, size))
 
-    @staticmethod
-    def _detect_byteorder(magic):
-        """Determines the binary's byteorder"""
+    def _unpack_lc(self, fmt: str, offset: FilePointer) -> tuple[typing.Any, ...]:
+        """
+        Unpacks fmt at the given file offset from the load commands read by _parse_load_commands, without
+        touching the file again
+        """
+        return self._compiled_struct(fmt).unpack_from(self._lc_blob, offset - self._lc_offset)
 
-        log.debug("Magic is %#x", magic)
+    @classmethod
+    def _detect_byteorder(cls, magic):
+        """Determines the binary's byteorder from the magic, which must be read as little-endian"""
 
-        host_is_little = sys.byteorder == "little"
+        log.debug("Magic is %#x", magic)
 
-        if host_is_little:
-            if magic in [MachO.MH_MAGIC_64, MachO.MH_MAGIC]:
-                log.debug("Detected little-endian")
-                return "<"
-            elif magic in [MachO.MH_CIGAM, MachO.MH_CIGAM_64]:
-                log.debug("Detected big-endian")
-                return ">"
-            else:
-                log.debug("Not a mach-o file")
-                raise CLECompatibilityError()
-        else:
-            if magic in [MachO.MH_MAGIC_64, MachO.MH_MAGIC]:
-                log.debug("Detected big-endian")
-                return ">"
-            elif magic in [MachO.MH_CIGAM_64, MachO.MH_CIGAM]:
-                log.debug("Detected little-endian")
-                return "<"
-            else:
-                log.debug("Not a mach-o file")
-                raise CLECompatibilityError()
+        try:
+            return cls._MAGIC_TO_BYTEORDER[magic]
+        except KeyError:
+            log.debug("Not a mach-o file")
+            raise CLECompatibilityError() from None
 
     def do_binding(self):
         # Perform binding
@@ -477,12 +769,17 @@ class MachO(Backend):
             log.debug("Parsing exports done: No exports found")
             return
 
-        # Note some of these fields are currently not used, keep them in to make used variables explicit
-        index = 0
-        sym_str = b""
-        # index,str
-        nodes_to_do = [(0, b"")]
-        blob_f = BytesIO(blob)  # easier to handle seeking here
+        # The trie is traversed depth first. Instead of building a new string for every edge, the name of the current
+        # node is kept in one shared bytearray. Every stack entry holds the node offset, the length of the parent's
+        # name and the position of the edge label in the blob, so the name is restored by truncating and extending.
+        # node offset, parent name length, label start, label end
+        nodes_to_do = [(0, 0, 0, 0)]
+        path = bytearray()
+        # pad once, so decode_uleb_swar can always load 8 bytes without bounds checks
+        blob += b"\0" * 8
+        blob_view = memoryview(blob)
+        # the per-node debug messages below are hit for every node in the trie, check the level only once
+        debug = log.isEnabledFor(logging.DEBUG)
 
         # constants
         # FLAGS_KIND_MASK = 0x03
@@ -492,67 +789,83 @@ class MachO(Backend):
         FLAGS_REEXPORT = 0x08
         FLAGS_STUB_AND_RESOLVER = 0x10
 
+        # Most ulebs in the trie fit into a single byte, so these are decoded inline instead of calling
+        # decode_uleb_swar. pos is the current offset into the blob
         try:
             while True:
-                index, sym_str = nodes_to_do.pop()
-                log.debug("Processing node %#x %r", index, sym_str)
-                blob_f.seek(index, SEEK_SET)
-                info_len = struct.unpack("B", blob_f.read(1))[0]
-                if info_len > 127:
-                    # special case
-                    blob_f.seek(-1, SEEK_CUR)
-                    tmp = read_uleb(blob, blob_f.tell())  # a bit kludgy
-                    info_len = tmp[0]
-                    blob_f.seek(tmp[1], SEEK_CUR)
+                index, parent_len, label_start, label_end = nodes_to_do.pop()
+                del path[parent_len:]
+                path += blob_view[label_start:label_end]
+                if debug:
+                    log.debug("Processing node %#x %r", index, path)
+                pos = index
+                info_len = blob[pos]
+                if info_len < 0x80:
+                    pos += 1
+                else:
+                    info_len, length = decode_uleb_swar(blob, pos)
+                    pos += length
 
                 if info_len > 0:
                     # a symbol is complete
-                    tmp = read_uleb(blob, blob_f.tell())
-                    blob_f.seek(tmp[1], SEEK_CUR)
-                    flags = tmp[0]
+                    sym_str = bytes(path)
+                    flags = blob[pos]
+                    if flags < 0x80:
+                        pos += 1
+                    else:
+                        flags, length = decode_uleb_swar(blob, pos)
+                        pos += length
                     if flags & FLAGS_REEXPORT:
                         # REEXPORT: uleb:lib ordinal, zero-term str
-                        tmp = read_uleb(blob, blob_f.tell())
-                        blob_f.seek(tmp[1], SEEK_CUR)
-                        lib_ordinal = tmp[0]
-                        lib_sym_name = b""
-                        char = blob_f.read(1)
-                        while char != b"\0":
-                            lib_sym_name += char
-                            char = blob_f.read(1)
+                        lib_ordinal = blob[pos]
+                        if lib_ordinal < 0x80:
+                            pos += 1
+                        else:
+                            lib_ordinal, length = decode_uleb_swar(blob, pos)
+                            pos += length
+                        end = blob.index(b"\0", pos)
+                        lib_sym_name = blob[pos:end]
+                        pos = end + 1
                         log.info("Found REEXPORT export %r: %d,%r", sym_str, lib_ordinal, lib_sym_name)
                         self.exports_by_name[sym_str.decode()] = (flags, lib_ordinal, lib_sym_name.decode())
                     elif flags & FLAGS_STUB_AND_RESOLVER:
                         # STUB_AND_RESOLVER: uleb: stub offset, uleb: resovler offset
                         log.warning("EXPORT: STUB_AND_RESOLVER found")
-                        tmp = read_uleb(blob, blob_f.tell())
-                        blob_f.seek(tmp[1], SEEK_CUR)
-                        stub_offset = tmp[0]
-                        tmp = read_uleb(blob, blob_f.tell())
-                        blob_f.seek(tmp[1], SEEK_CUR)
-                        resolver_offset = tmp[0]
+                        stub_offset, length = decode_uleb_swar(blob, pos)
+                        pos += length
+                        resolver_offset, length = decode_uleb_swar(blob, pos)
+                        pos += length
                         log.info("Found STUB_AND_RESOLVER export %r: %#x,%#x'", sym_str, stub_offset, resolver_offset)
                         self.exports_by_name[sym_str.decode()] = (flags, stub_offset, resolver_offset)
                     else:
                         # normal: offset from mach header
-                        tmp = read_uleb(blob, blob_f.tell())
-                        blob_f.seek(tmp[1], SEEK_CUR)
-                        symbol_offset = tmp[0] + self.linked_base
-                        log.debug("Found normal export %r: %#x", sym_str, symbol_offset)
+                        symbol_offset = blob[pos]
+                        if symbol_offset < 0x80:
+                            pos += 1
+                        else:
+                            symbol_offset, length = decode_uleb_swar(blob, pos)
+                            pos += length
+                        symbol_offset += self.linked_base
+                        if debug:
+                            log.debug("Found normal export %r: %#x", sym_str, symbol_offset)
                         self.exports_by_name[sym_str.decode()] = (flags, symbol_offset)
 
-                child_count = struct.unpack("B", blob_f.read(1))[0]
+                child_count = blob[pos]
+                pos += 1
+                path_len = len(path)
                 for i in range(0, child_count):
-                    child_str = sym_str
-                    char = blob_f.read(1)
-                    while char != b"\0":
-                        child_str += char
-                        char = blob_f.read(1)
-                    tmp = read_uleb(blob, blob_f.tell())
-                    blob_f.seek(tmp[1], SEEK_CUR)
-                    next_node = tmp[0]
-                    log.debug("%d. child: (%#x, %r)", i, next_node, child_str)
-                    nodes_to_do.append((next_node, child_str))
+                    label_start = pos
+                    label_end = blob.index(b"\0", pos)
+                    pos = label_end + 1
+                    next_node = blob[pos]
+                    if next_node < 0x80:
+                        pos += 1
+                    else:
+                        next_node, length = decode_uleb_swar(blob, pos)
+                        pos += length
+                    if debug:
+                        log.debug("%d. child of %r: %#x, label at %#x", i, path, next_node, label_start)
+                    nodes_to_do.append((next_node, path_len, label_start, label_end))
 
         except IndexError:
             # List is empty we are done!
@@ -579,7 +892,7 @@ class MachO(Backend):
     def _load_lc_data_in_code(self, f, off):
         log.debug("Parsing data in code")
 
-        (_, _, dataoff, datasize) = self._unpack("4I", f, off, 16)
+        (dataoff, datasize) = self._unpack_lc("2I", off + 8)
         for i in range(dataoff, datasize, 8):
             blob = self._unpack("IHH", f, i, 8)
             self.lc_data_in_code.append(blob)
@@ -588,7 +901,7 @@ class MachO(Backend):
 
     def _assert_unencrypted(self, f, off):
         log.debug("Asserting unencrypted file")
-        (_, _, _, _, cryptid) = self._unpack("5I", f, off, 20)
+        (cryptid,) = self._unpack_lc("I", off + 16)
         if cryptid > 0:
             log.error("Cannot load encrypted files")
             raise CLEInvalidBinaryError()
@@ -596,12 +909,11 @@ class MachO(Backend):
     def _load_lc_function_starts(self, f, off):
         # note that the logic below is based on Apple's dyldinfo.cpp, no official docs seem to exist
         log.debug("Parsing function starts")
-        (_, _, dataoff, datasize) = self._unpack("4I", f, off, 16)
+        (dataoff, datasize) = self._unpack_lc("2I", off + 8)
 
         i = 0
         end = datasize
-        blob = self._read(f, dataoff, datasize)
-        self.lc_function_starts = []
+        blob = self._read(f, dataoff, datasize) + b"\0" * 8  # padding for decode_uleb_swar
 
         address = None
         for seg in self.segments:
@@ -614,17 +926,27 @@ class MachO(Backend):
             raise CLEInvalidBinaryError()
         log.debug("Located base-address: %#x", address)
 
+        # deltas between function starts almost always fit into one or two bytes, decode these inline
+        deltas = []
         while i < end:
-            uleb = read_uleb(blob, i)
-
-            if blob[i] == 0:
+            b = blob[i]
+            if b == 0:
                 break  # list is 0 terminated
 
-            address += uleb[0]
+            if b < 0x80:
+                deltas.append(b)
+                i += 1
+            elif blob[i + 1] < 0x80:
+                deltas.append((b & 0x7F) | (blob[i + 1] << 7))
+                i += 2
+            else:
+                delta, length = decode_uleb_swar(blob, i)
+                deltas.append(delta)
+                i += length
 
-            self.lc_function_starts.append(address)
-            log.debug("Function start @ %#x (%#x)", uleb[0], address)
-            i += uleb[1]
+        # each start is relative to the previous one, the running sum is computed by accumulate in one call
+        self.lc_function_starts = list(itertools.accumulate(deltas, initial=address))[1:]
+        log.debug("Found %d function starts", len(self.lc_function_starts))
         log.debug("Done parsing function starts")
 
     def _load_lc_main(self, f, offset):
@@ -632,7 +954,7 @@ class MachO(Backend):
             log.error("More than one entry point for main detected, abort.")
             raise CLEInvalidBinaryError()
 
-        (_, _, self.entryoff, _) = self._unpack("2I2Q", f, offset, 24)
+        (_, _, self.entryoff, _) = self._unpack_lc("2I2Q", offset)
         log.debug("LC_MAIN: entryoff=%#x", self.entryoff)
 
     def _load_lc_unixthread(self, f, offset):
@@ -642,15 +964,15 @@ class MachO(Backend):
 
         # parse basic structure
         # _, cmdsize, flavor, long_count
-        _, _, flavor, _ = self._unpack("4I", f, offset, 16)
+        _, _, flavor, _ = self._unpack_lc("4I", offset)
 
         # we only support 4 different types of thread state atm
         # TODO: This is the place to add x86 and x86_64 thread states
         if flavor == 1 and self.arch.bits != 64:  # ARM_THREAD_STATE or ARM_UNIFIED_THREAD_STATE or ARM_THREAD_STATE32
-            blob = self._unpack("16I", f, offset + 16, 64)  # parses only until __pc
+            blob = self._unpack_lc("16I", offset + 16)  # parses only until __pc
         elif flavor == 1 and self.arch.bits == 64 or flavor == 6:
             # ARM_THREAD_STATE or ARM_UNIFIED_THREAD_STATE or ARM_THREAD_STATE64
-            blob = self._unpack("33Q", f, offset + 16, 264)  # parses only until __pc
+            blob = self._unpack_lc("33Q", offset + 16)  # parses only until __pc
         else:
             log.error("Unknown thread flavor: %d", flavor)
             raise CLECompatibilityError()
@@ -659,7 +981,7 @@ class MachO(Backend):
         log.debug("LC_UNIXTHREAD: __pc=%#x", self.unixthread_pc)
 
     def _load_dylib_info(self, f, offset):
-        (_, _, name_offset, _, _, _) = self._unpack("6I", f, offset, 24)
+        (name_offset,) = self._unpack_lc("I", offset + 8)
         lib_path = self.parse_lc_str(f, offset + name_offset)
         log.debug("Adding library %r", lib_path)
         lib_base_name = lib_path.decode("utf-8").rsplit("/", 1)[-1]
@@ -670,7 +992,7 @@ class MachO(Backend):
         """
         Extracts information blobs for rebasing, binding and export
         """
-        (_, _, roff, rsize, boff, bsize, wboff, wbsize, lboff, lbsize, eoff, esize) = self._unpack("12I", f, offset, 48)
+        (_, _, roff, rsize, boff, bsize, wboff, wbsize, lboff, lbsize, eoff, esize) = self._unpack_lc("12I", offset)
 
         def blob_or_None(f: BufferedReader, off: int, size: int) -> bytes | None:  # helper
             return self._read(f, off, size) if off != 0 and size != 0 else None
@@ -690,7 +1012,7 @@ class MachO(Backend):
         :return:
         """
 
-        (_, _, symoff, nsyms, stroff, strsize) = self._unpack("6I", f, offset, 24)
+        (_, _, symoff, nsyms, stroff, strsize) = self._unpack_lc("6I", offset)
 
         # load string table
         self.strtab = self._read(f, stroff, strsize)
@@ -716,17 +1038,30 @@ class MachO(Backend):
             packstr = "I2BhI"
             structsize = 12
 
-        for i in range(0, self.symtab_nsyms):
+        # read the whole symbol table at once instead of issuing one read per entry
+        raw = self._read(f, self.symtab_offset, self.symtab_nsyms * structsize)
+        if len(raw) < self.symtab_nsyms * structsize:
+            raise CLEInvalidBinaryError("Symbol table extends past the end of the file")
+        entries = self._compiled_struct(packstr).iter_unpack(raw)
+        symbols = []
+        debug = log.isEnabledFor(logging.DEBUG)
+
+        for i, (n_strx, n_type, n_sect, n_desc, n_value) in enumerate(entries):
             # The relevant struct is nlist_64 which is defined and documented in mach-o/nlist.h
             offset_in_symtab = i * structsize
-            offset = offset_in_symtab + self.symtab_offset
-            (n_strx, n_type, n_sect, n_desc, n_value) = self._unpack(packstr, f, offset, structsize)
-            log.debug("Adding symbol # %d @ %#x: %s,%s,%s,%s,%s", i, offset, n_strx, n_type, n_sect, n_desc, n_value)
             sym = SymbolTableSymbol(self, offset_in_symtab, n_strx, n_type, n_sect, n_desc, n_value)
-            self.symbols.add(sym)
-            self._ordered_symbols.append(sym)
+            symbols.append(sym)
 
-            log.debug("Symbol # %d @ %#x is '%s'", i, offset, sym.name)
+            if debug:
+                offset = offset_in_symtab + self.symtab_offset
+                log.debug(
+                    "Adding symbol # %d @ %#x: %s,%s,%s,%s,%s", i, offset, n_strx, n_type, n_sect, n_desc, n_value
+                )
+                log.debug("Symbol # %d @ %#x is '%s'", i, offset, sym.name)
+
+        # insert all symbols at once, sorting them in one go is much cheaper than nsyms sorted insertions
+        self.symbols.update(symbols)
+        self._ordered_symbols.extend(symbols)
 
     def get_string(self, start):
         """Loads a string from the string table"""
@@ -734,25 +1069,24 @@ class MachO(Backend):
         if start in self._indexed_strtab:
             return self._indexed_strtab[start]
 
-        end = start
-        if end > len(self.strtab):
+        if start > len(self.strtab):
             raise ValueError()
 
-        while end < len(self.strtab):
-            if self.strtab[end] == 0:
-                return self.strtab[start:end]
-            end += 1
-        return self.strtab[start:]
+        end = self.strtab.find(b"\0", start)
+        return self.strtab[start:] if end < 0 else self.strtab[start:end]
 
     def parse_lc_str(self, f, start, limit: int | None = None):
         """Parses a lc_str data structure"""
-        tmp = self._unpack("c", f, start, 1)[0]
         s = b""
-        ctr = 0
-        while tmp != b"\0" and (limit is None or ctr < limit):
-            s += tmp
-            ctr += 1
-            tmp = self._unpack("c", f, start + ctr, 1)[0]
+        while limit is None or len(s) < limit:
+            chunk_size = 256 if limit is None else min(256, limit - len(s))
+            chunk = self._read(f, start + len(s), chunk_size)
+            end = chunk.find(b"\0")
+            if end != -1:
+                return s + chunk[:end]
+            if not chunk:
+                raise CLEInvalidBinaryError(f"Unterminated lc_str at file offset {start:#x}")
+            s += chunk
 
         return s
 
@@ -767,17 +1101,17 @@ class MachO(Backend):
         is64 = self.arch.bits == 64
         if not is64:
             segment_s_size = 56
-            (_, _, segname, vmaddr, vmsize, fileoff, filesize, maxprot, initprot, nsects, flags) = self._unpack(
-                "2I16s8I", f, offset, segment_s_size
+            (_, _, segname, vmaddr, vmsize, fileoff, filesize, maxprot, initprot, nsects, flags) = self._unpack_lc(
+                "2I16s8I", offset
             )
         else:
             segment_s_size = 72
-            (_, _, segname, vmaddr, vmsize, fileoff, filesize, maxprot, initprot, nsects, flags) = self._unpack(
-                "2I16s4Q4I", f, offset, segment_s_size
+            (_, _, segname, vmaddr, vmsize, fileoff, filesize, maxprot, initprot, nsects, flags) = self._unpack_lc(
+                "2I16s4Q4I", offset
             )
 
         # Cleanup segname
-        segname = segname.replace(b"\0", b"")
+        segname = segname.rstrip(b"\0")
         log.debug("Processing segment %r", segname)
 
         # create segment
@@ -795,8 +1129,13 @@ class MachO(Backend):
             # fields (reserved2,reserved3) because it makes the parsing logic below easier
             section_s_packstr = "16s16s2Q6IQ"
 
-        section_start = offset + segment_s_size
-        for i in range(0, nsects):
+        # The section headers directly follow the segment command, decode all of them in one pass
+        section_start = offset + segment_s_size - self._lc_offset
+        section_headers = memoryview(self._lc_blob)[section_start : section_start + nsects * section_s_size]
+        if len(section_headers) < nsects * section_s_size:
+            raise CLEInvalidBinaryError(f"Section headers of segment {segname!r} extend past the load commands")
+        section_struct = self._compiled_struct(section_s_packstr)
+        for i, section_header in enumerate(section_struct.iter_unpack(section_headers)):
             # Read section
             log.debug("Processing section # %d in %r", i + 1, segname)
             (
@@ -811,11 +1150,11 @@ class MachO(Backend):
                 section_flags,
                 r1,
                 r2,
-            ) = self._unpack(section_s_packstr, f, (i * section_s_size) + section_start, section_s_size)
+            ) = section_header
 
             # Clean segname and sectname
-            section_sectname = section_sectname.replace(b"\0", b"")
-            section_segname = section_segname.replace(b"\0", b"")
+            section_sectname = section_sectname.rstrip(b"\0")
+            section_segname = section_segname.rstrip(b"\0")
 
             # Create section
             sec = MachOSection(
@@ -848,9 +1187,10 @@ class MachO(Backend):
             log.info("Found PAGEZERO, skipping backer for memory conservation")
         elif seg.filesize > 0:
             # Append segment data to memory
-            blob = self._read(f, seg.offset, seg.filesize)
-            if seg.filesize < seg.memsize:
-                blob += b"\0" * (seg.memsize - seg.filesize)  # padding
+            # The zero padding up to memsize comes from allocating the backer at full size and copying the file data
+            # into its start, instead of concatenating a padding string. add_backer keeps a bytearray as is.
+            blob = bytearray(seg.memsize)
+            blob[: seg.filesize] = self._read(f, seg.offset, seg.filesize)
 
             # The memory of the Backend itself should start at 0, where 0 is the lowest meaningful address
             # In our case this would be the Mach header magic
@@ -860,21 +1200,34 @@ class MachO(Backend):
 
         # Store segment
         self.segments.append(seg)
+        self._segments_by_name.setdefault(seg.segname, seg)
 
     S = typing.TypeVar("S", bound=Union[ctypes.Structure, ctypes.Union])
 
     def _get_struct(self, struct_type: type[S], offset: int) -> S:
+        if self._file_map is not None:
+            return struct_type.from_buffer_copy(self._file_map, offset)
         data = self._read(self._binary_stream, offset, ctypes.sizeof(struct_type))
         return struct_type.from_buffer_copy(data)
 
     def _read_cstring_from_file(self, start: FilePointer, max_length=None):
         """
-        This technically has unnecessary quadratic runtime behavior in `buffer.find` and `buffer+= ...`
-        but this shouldn't be noticeable in practice.
+        Searches the file mapping for the terminator while the file is being parsed. Without a mapping, the stream is
+        read in 1024 byte chunks, which technically has unnecessary quadratic runtime behavior in `buffer.find` and
+        `buffer+= ...` but this shouldn't be noticeable in practice.
         :param start:
         :param max_length:
         :return:
         """
+        if self._file_map is not None:
+            search_end = len(self._file_map) if max_length is None else start + max_length + 1
+            end = self._file_map.find(b"\x00", start, search_end)
+            if end == -1:
+                if max_length is None:
+                    raise ValueError(f"Unterminated string at file offset {start:#x}")
+                raise ValueError(f"Symbol name exceeds {max_length} bytes, giving up")
+            return self._file_map[start:end]
+
         end = -1
         buffer = b""
         while end == -1:
@@ -943,6 +1296,7 @@ class MachO(Backend):
 
         # The struct isn't straightforward to parse with ctypes, so we do it manually
         seg_count = self._unpack("I", self._binary_stream, segs_addr, 4)[0]
+        debug = log.isEnabledFor(logging.DEBUG)
 
         segs: list[FileOffset] = []
         for i in range(seg_count):
@@ -995,13 +1349,15 @@ class MachO(Backend):
                         self.relocs.append(reloc)
                         # Legacy Code uses bind_xrefs, explicitly add this to make this compatible for now
                         import_symbol.bind_xrefs.append(reloc.dest_addr + self.linked_base)
-                        log.debug("Binding for %s found at %x", import_symbol, current_chain_addr)
+                        if debug:
+                            log.debug("Binding for %s found at %x", import_symbol, current_chain_addr)
                     elif rebase is not None:
                         target = self.linked_base + rebase
                         location: MemoryPointer = self.linked_base + current_chain_addr
                         anon_reloc = MachOPointerRelocation(owner=self, relative_addr=current_chain_addr, data=rebase)
                         self.relocs.append(anon_reloc)
-                        log.debug("Rebase to %x found at %x", target, location)
+                        if debug:
+                            log.debug("Rebase to %x found at %x", target, location)
 
                     else:
                         raise CLEInvalidBinaryError("FixupPointer was neither bind nor rebase, that shouldn't happen")
@@ -1015,13 +1371,16 @@ class MachO(Backend):
         """
         Locates a symbol by checking the given address against sym.addr, sym.bind_xrefs and
         sym.symbol_stubs
+
+        The lookup uses an index that is built on the first call and rebuilt when symbols are added or removed. Changes
+        to the bind_xrefs or symbol_stubs of existing symbols after that are not picked up, remove and re-add the
+        symbol to make them visible.
         """
-        for sym in self.symbols:
-            if address == sym.relative_addr or address in sym.bind_xrefs or address in sym.symbol_stubs:
-                return sym
-        return None
+        return self._get_symbol_index().by_address().get(address)
 
-    def get_symbol(self, name, include_stab=False, fuzzy=False):  # pylint: disable=arguments-differ
+    def get_symbol(
+        self, name, include_stab=False, fuzzy=False, case_insensitive=False, prefix=False
+    ):  # pylint: disable=arguments-differ
         """
         Returns all symbols matching name.
 
@@ -1031,21 +1390,194 @@ class MachO(Backend):
         :param name: the name of the symbol
         :param include_stab: Include debugging symbols NOT RECOMMENDED
         :param fuzzy: Replace exact match with "contains"-style match
+        :param case_insensitive: Compare casefolded names
+        :param prefix: Replace exact match with "starts with"-style match
         """
-        result = []
-        for sym in self.symbols:
-            if sym.is_stab and not include_stab:
+        if fuzzy and prefix:
+            raise ValueError("fuzzy and prefix cannot be combined")
+        index = self._get_symbol_index()
+        if prefix:
+            return self._get_symbols_by_prefix(index, name, include_stab, case_insensitive)
+        if not fuzzy:
+            if case_insensitive:
+                folded = name.casefold()
+                if index.name_index is None:
+                    names, syms = index.sorted_casefolded_names(include_stab)
+                    i = bisect.bisect_left(names, folded)
+                    return syms[i : bisect.bisect_right(names, folded, i)]
+                return list(index.casefolded_names(include_stab)[1].get(folded, ()))
+            if index.name_index is None:
+                return self._get_symbol_sorted(index, name, include_stab)
+            return list((index.name_index if include_stab else index.name_index_nostab).get(name, ()))
+
+        # fuzzy lookups have to search all names, remember the last one as the same query is often repeated
+        key = (name, include_stab, case_insensitive)
+        if key != index.last_fuzzy_key:
+            index.last_fuzzy_result = self.get_symbols_matching(
+                (name,), include_stab=include_stab, case_insensitive=case_insensitive
+            )[name]
+            index.last_fuzzy_key = key
+        return list(index.last_fuzzy_result)
+
+    def get_symbols_by_names(self, names, include_stab=False) -> dict[str, list[AbstractMachOSymbol]]:
+        """
+        Exact lookup of several names at once, like calling get_symbol for each of them.
+
+        :param names: the names of the symbols
+        :param include_stab: Include debugging symbols NOT RECOMMENDED
+        :return: a dict from each name to its symbols, in address order
+        """
+        index = self._get_symbol_index()
+        if index.name_index is not None:
+            name_index = index.name_index if include_stab else index.name_index_nostab
+            return {name: list(name_index.get(name, ())) for name in names}
+
+        # without the name index, collect the hits for all names in a single pass over the symbols
+        result = {name: [] for name in names}
+        for _, sym_name, sym in index.sym_tuples if include_stab else index.sym_tuples_nostab:
+            hits = result.get(sym_name)
+            if hits is not None:
+                hits.append(sym)
+        return result
+
+    def find_first_symbol(
+        self, name, include_stab=False, fuzzy=False, case_insensitive=False, prefix=False
+    ) -> AbstractMachOSymbol | None:
+        """
+        Returns the first symbol, in address order, that get_symbol would return with the same arguments, or None if
+        there is none. Fuzzy lookups stop at the first match instead of collecting all of them.
+
+        :param name: the name of the symbol
+        :param include_stab: Include debugging symbols NOT RECOMMENDED
+        :param fuzzy: Replace exact match with "contains"-style match
+        :param case_insensitive: Compare casefolded names
+        :param prefix: Replace exact match with "starts with"-style match
+        """
+        if fuzzy and not prefix:
+            pattern = name.casefold() if case_insensitive else name
+            if pattern and "\0" not in pattern:
+                # the joined names are in address order, so the first hit in them is the first matching symbol
+                names, starts, sym_tuples = self._get_symbol_index().joined_names(include_stab, case_insensitive)
+                i = names.find(pattern)
+                return sym_tuples[bisect.bisect_right(starts, i) - 1][2] if i >= 0 else None
+
+        symbols = self.get_symbol(
+            name, include_stab=include_stab, fuzzy=fuzzy, case_insensitive=case_insensitive, prefix=prefix
+        )
+        return symbols[0] if symbols else None
+
+    def get_symbols_matching(
+        self, patterns, include_stab=False, case_insensitive=False
+    ) -> dict[str, list[AbstractMachOSymbol]]:
+        """
+        Returns all symbols whose name contains one of the given patterns, like get_symbol with fuzzy=True.
+
+        All names are joined into one NUL separated string that is searched with str.find, so each pattern costs a
+        single search in C instead of one substring test per symbol. Once a pattern has matched more than one in
+        _FIND_MAX_HIT_RATIO names, the remaining names are tested one by one instead.
+
+        :param patterns: the substrings to look for
+        :param include_stab: Include debugging symbols NOT RECOMMENDED
+        :param case_insensitive: Compare casefolded names and patterns
+        :return: a dict from each pattern to its matching symbols, in address order
+        """
+        names, starts, sym_tuples = self._get_symbol_index().joined_names(include_stab, case_insensitive)
+        find = names.find
+        bisect_right = bisect.bisect_right
+        max_finds = len(sym_tuples) // self._FIND_MAX_HIT_RATIO
+
+        result = {}
+        for query in patterns:
+            if query in result:
                 continue
+            pattern = query.casefold() if case_insensitive else query
+            matches = []
+            k = -1  # the last name that was searched with str.find
+            if pattern and "\0" not in pattern:
+                add_match = matches.append
+                finds_left = max_finds
+                i = find(pattern)
+                while i >= 0 and finds_left:
+                    k = bisect_right(starts, i) - 1
+                    add_match(sym_tuples[k][2])
+                    finds_left -= 1
+                    # continue after the matching name, a name is reported only once
+                    i = find(pattern, starts[k + 1])
+                if i < 0:
+                    result[query] = matches
+                    continue
 
-            if fuzzy:
-                if name in sym.name:
-                    result.append(sym)
-            else:
-                if name == sym.name:
-                    result.append(sym)
+            # names shorter than the pattern cannot contain it, checking the length first skips the search
+            pattern_len = len(pattern)
+            matches.extend(
+                sym
+                for sym_len, sym_name, sym in itertools.islice(sym_tuples, k + 1, None)
+                if sym_len >= pattern_len and pattern in sym_name
+            )
+            result[query] = matches
+        return result
+
+    def _get_symbol_index(self) -> _SymbolIndex:
+        """
+        Returns the lookup tables for the current symbols. They are built on first use and replaced when symbols are
+        added or removed.
+        """
+        index = self._symbol_index
+        if index is None or index.version != self.symbols.version:
+            index = self._symbol_index = _SymbolIndex(self.symbols, self._use_name_index)
+        return index
 
+    @staticmethod
+    def _get_symbol_sorted(index: _SymbolIndex, name, include_stab):
+        """
+        Exact get_symbol lookup without the name dicts. The first lookups after a change scan the names, later ones
+        bisect the symbols sorted by name, see _SymbolIndex.SCAN_LOOKUPS
+        """
+        result = []
+        names = index.names_to_scan()
+        if names is not None:
+            # list.index does the compares in C, so only the hits cost Python bytecode
+            sym_tuples = index.sym_tuples
+            stabs = index.is_stab
+            i = -1
+            try:
+                while True:
+                    i = names.index(name, i + 1)
+                    if include_stab or not stabs[i]:
+                        result.append(sym_tuples[i][2])
+            except ValueError:
+                return result
+
+        names, syms, stabs, _ = index.sorted_names()
+        i = bisect.bisect_left(names, name)
+        while i < len(names) and names[i] == name:
+            if include_stab or not stabs[i]:
+                result.append(syms[i])
+            i += 1
         return result
 
+    @staticmethod
+    def _get_symbols_by_prefix(index: _SymbolIndex, prefix, include_stab, case_insensitive):
+        """
+        get_symbol lookup for names starting with prefix. The names sharing a prefix are next to each other in the name
+        sorted view, so they are found by bisecting instead of testing every name.
+        """
+        if case_insensitive:
+            folded = prefix.casefold()
+            sym_tuples = index.casefolded_names(include_stab)[0]
+            return [sym for _, sym_name, sym in sym_tuples if sym_name.startswith(folded)]
+
+        names, syms, stabs, order = index.sorted_names()
+        hits = []
+        i = bisect.bisect_left(names, prefix)
+        while i < len(names) and names[i].startswith(prefix):
+            if include_stab or not stabs[i]:
+                hits.append((order[i], syms[i]))
+            i += 1
+        # back to address order, the positions are unique so the symbols are never compared
+        hits.sort(key=operator.itemgetter(0))
+        return [sym for _, sym in hits]
+
     def get_symbol_by_insertion_order(self, idx: int) -> AbstractMachOSymbol:
         """
 
@@ -1060,12 +1592,7 @@ class MachO(Backend):
         :param name: Name of the sought segment
         :return: MachOSegment or None
         """
-        for seg in self.segments:
-            seg: MachOSection | MachOSegment
-            if seg.segname == name:
-                return seg
-
-        return None
+        return self._segments_by_name.get(name)
 
     def __getitem__(self, item):
         """
@@ -1073,6 +1600,22 @@ class MachO(Backend):
         """
         return self.get_segment_by_name(item)
 
+    def __getstate__(self):
+        state = super().__getstate__()
+        # compiled structs cannot be pickled, _compiled_struct recreates them when needed
+        state["_structs"] = {}
+        # the lookup tables are rebuilt from the symbols on first use
+        state["_symbol_index"] = None
+        return state
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        # Backend restores the symbols as a plain SortedKeyList, which has neither the name/ordinal cache nor the
+        # version the derived indexes are checked against
+        symbols = SymbolList(key=self._get_symbol_relative_addr)
+        symbols.update(self.symbols)
+        self.symbols = symbols
+
     segments: Regions[MachOSegment]
 
 
@@ -2,6 +2,8 @@
 # Contributed December 2016 by Fraunhofer SIT (https://www.sit.fraunhofer.de/en/).
 from __future__ import annotations
 
+import sys
+
 from cle.backends.region import Section
 
 from .segment import MachOSegment
@@ -43,11 +45,12 @@ class MachOSection(Section):
         r2,
         parent_segment: MachOSegment | None = None,
     ):
-        super().__init__(sectname.decode(), offset, vaddr, size)
+        sectname = sys.intern(sectname.decode())
+        super().__init__(sectname, offset, vaddr, size)
         self.filesize = size
         self.memsize = vsize
-        self.segname = segname.decode()
-        self.sectname = sectname.decode()
+        self.segname = sys.intern(segname.decode())
+        self.sectname = sectname
         self.align = align
         self.reloff = reloff
         self.nreloc = nreloc
@@ -2,6 +2,8 @@
 # Contributed December 2016 by Fraunhofer SIT (https://www.sit.fraunhofer.de/en/).
 from __future__ import annotations
 
+import sys
+
 from cle.backends.region import Segment
 
 
@@ -23,7 +25,7 @@ class MachOSegment(Segment):
     def __init__(self, offset, vaddr, size, vsize, segname, nsect, sections, flags, initprot, maxprot):
         super().__init__(offset, vaddr, size, vsize)
 
-        self.segname = segname.decode()
+        self.segname = sys.intern(segname.decode())
         self.nsect = nsect
         self.sections = sections
         self.flags = flags
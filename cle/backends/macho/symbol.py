@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+import sys
 from typing import TYPE_CHECKING
 
 from cle import AT
@@ -40,7 +41,8 @@ class AbstractMachOSymbol(Symbol):
     owner: MachO
 
     def __init__(self, owner: Backend, name: str, relative_addr: int, size: int, sym_type: SymbolType):
-        super().__init__(owner, name, relative_addr, size, sym_type)
+        # names repeat a lot (stabs, imports of the same symbol), interning shares one string and makes compares cheap
+        super().__init__(owner, sys.intern(name), relative_addr, size, sym_type)
 
         # additional properties
         self.bind_xrefs = []  # XREFs discovered during binding of the symbol
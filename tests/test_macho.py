@@ -3,9 +3,13 @@ from __future__ import annotations
 
 import logging
 import os
+import pickle
+import struct
+from io import BytesIO
 
 import cle
 from cle import MachO
+from cle.backends.macho.macho import SymbolList
 from cle.backends.macho.section import MachOSection
 
 TEST_BASE = os.path.join(os.path.dirname(os.path.realpath(__file__)), os.path.join("..", "..", "binaries"))
@@ -21,6 +25,170 @@ def test_fauxware():
     assert sorted(list(ld.main_object.exports_by_name))[-1] == "_sneaky"
 
 
+def _lookup_cases():
+    """
+    Yields the main object of fauxware.macho loaded with and without the symbol name index, once for each include_stab
+    value, as (obj, include_stab)
+    """
+    machofile = os.path.join(TEST_BASE, "tests", "x86_64", "fauxware.macho")
+    for symbol_name_index in (True, False):
+        ld = cle.Loader(machofile, auto_load_libs=False, main_opts={"symbol_name_index": symbol_name_index})
+        for include_stab in (True, False):
+            yield ld.main_object, include_stab
+
+
+def _linear_lookup(obj, name, include_stab=False, fuzzy=False, case_insensitive=False, prefix=False):
+    """
+    What get_symbol should return, found by testing every symbol
+    """
+    if case_insensitive:
+        name = name.casefold()
+    result = []
+    for sym in obj.symbols:
+        if sym.is_stab and not include_stab:
+            continue
+        sym_name = sym.name.casefold() if case_insensitive else sym.name
+        if fuzzy:
+            matches = name in sym_name
+        elif prefix:
+            matches = sym_name.startswith(name)
+        else:
+            matches = sym_name == name
+        if matches:
+            result.append(sym)
+    return result
+
+
+def test_symbol_name_index():
+    for obj, include_stab in _lookup_cases():
+        for name in {sym.name for sym in obj.symbols} | {"", "_does_not_exist"}:
+            assert obj.get_symbol(name, include_stab=include_stab) == _linear_lookup(obj, name, include_stab)
+
+
+def test_get_symbol_case_insensitive():
+    for obj, include_stab in _lookup_cases():
+        names = [sym.name for sym in obj.symbols]
+        for query in names + [name.upper() for name in names] + [name.swapcase()[1:-1] for name in names] + [""]:
+            expected = _linear_lookup(obj, query, include_stab, case_insensitive=True)
+            assert obj.get_symbol(query, include_stab=include_stab, case_insensitive=True) == expected
+            expected = _linear_lookup(obj, query, include_stab, fuzzy=True, case_insensitive=True)
+            assert obj.get_symbol(query, include_stab=include_stab, fuzzy=True, case_insensitive=True) == expected
+            assert obj.get_symbols_matching([query], include_stab=include_stab, case_insensitive=True) == {
+                query: expected
+            }
+
+
+def test_get_symbol_prefix():
+    for obj, include_stab in _lookup_cases():
+        names = [sym.name for sym in obj.symbols]
+        for query in names + [name[:3] for name in names] + [name[:3].upper() for name in names] + ["", "_", "~"]:
+            for case_insensitive in (False, True):
+                expected = _linear_lookup(obj, query, include_stab, prefix=True, case_insensitive=case_insensitive)
+                found = obj.get_symbol(query, include_stab=include_stab, prefix=True, case_insensitive=case_insensitive)
+                assert found == expected
+
+        try:
+            obj.get_symbol("_main", fuzzy=True, prefix=True)
+            assert False, "fuzzy and prefix should not be accepted together"
+        except ValueError:
+            pass
+
+
+def test_get_symbols_matching():
+    for obj, include_stab in _lookup_cases():
+        names = [sym.name for sym in obj.symbols]
+        # whole names, parts of names, very common substrings and patterns that match nothing
+        patterns = names + [name[1:-1] for name in names] + ["", "_", "a", "e", "main", "_does_not_exist", "\0"]
+        result = obj.get_symbols_matching(patterns, include_stab=include_stab)
+        assert set(result) == set(patterns)
+        for pattern in patterns:
+            expected = _linear_lookup(obj, pattern, include_stab, fuzzy=True)
+            assert result[pattern] == expected
+            assert obj.get_symbol(pattern, include_stab=include_stab, fuzzy=True) == expected
+
+
+def test_get_symbols_by_names():
+    for obj, include_stab in _lookup_cases():
+        # duplicates and names without symbols are part of the batch too
+        names = [sym.name for sym in obj.symbols] * 2 + ["", "_does_not_exist"]
+        result = obj.get_symbols_by_names(names, include_stab=include_stab)
+        assert set(result) == set(names)
+        for name in names:
+            assert result[name] == _linear_lookup(obj, name, include_stab)
+
+
+def test_find_first_symbol():
+    for obj, include_stab in _lookup_cases():
+        names = [sym.name for sym in obj.symbols]
+        queries = names + [name[1:-1] for name in names] + [name.upper() for name in names] + ["", "_", "\0"]
+        for query in queries:
+            for kwargs in [
+                {},
+                {"fuzzy": True},
+                {"prefix": True},
+                {"case_insensitive": True},
+                {"fuzzy": True, "case_insensitive": True},
+                {"prefix": True, "case_insensitive": True},
+            ]:
+                expected = _linear_lookup(obj, query, include_stab, **kwargs)
+                first = obj.find_first_symbol(query, include_stab=include_stab, **kwargs)
+                assert first is (expected[0] if expected else None)
+
+
+def test_get_symbol_by_address_fuzzy():
+    machofile = os.path.join(TEST_BASE, "tests", "x86_64", "fauxware.macho")
+    ld = cle.Loader(machofile, auto_load_libs=False)
+    obj = ld.main_object
+
+    def scan(address):
+        for sym in obj.symbols:
+            if address == sym.relative_addr or address in sym.bind_xrefs or address in sym.symbol_stubs:
+                return sym
+        return None
+
+    # stubs are indexed like addresses and bind xrefs, the first symbol in address order wins
+    sym = obj.symbols[len(obj.symbols) // 2]
+    sym.symbol_stubs.append(0x123456789)
+    obj.symbols[0].symbol_stubs.append(sym.relative_addr)
+
+    for other in obj.symbols:
+        for address in [other.relative_addr, *other.bind_xrefs, *other.symbol_stubs]:
+            assert obj.get_symbol_by_address_fuzzy(address) is scan(address)
+    assert obj.get_symbol_by_address_fuzzy(0x123456789) is sym
+    assert obj.get_symbol_by_address_fuzzy(sym.relative_addr) is obj.symbols[0]
+    assert obj.get_symbol_by_address_fuzzy(0x987654321) is None
+
+    # in place changes show up once the symbol is removed and added again
+    sym.symbol_stubs.append(0x987654321)
+    obj.symbols.remove(sym)
+    obj.symbols.add(sym)
+    assert obj.get_symbol_by_address_fuzzy(0x987654321) is sym
+
+
+def test_symbol_list_invalidation():
+    machofile = os.path.join(TEST_BASE, "tests", "x86_64", "fauxware.macho")
+    ld = cle.Loader(machofile, auto_load_libs=False)
+    obj = ld.main_object
+
+    sym = next(sym for sym in obj.symbols if not sym.is_stab and sym.name)
+    name, ordinal = sym.name, sym.library_ordinal
+    assert sym in obj.get_symbol(name)
+    assert sym in obj.symbols.get_by_name_and_ordinal(name, ordinal)
+
+    obj.symbols.remove(sym)
+    assert sym not in obj.get_symbol(name)
+    assert sym not in obj.symbols.get_by_name_and_ordinal(name, ordinal)
+    assert sym not in obj.symbols.get_by_name_and_ordinal(name, ordinal, include_stab=True)
+
+    obj.symbols.add(sym)
+    assert sym in obj.get_symbol(name)
+    assert sym in obj.symbols.get_by_name_and_ordinal(name, ordinal)
+
+    obj.symbols.clear()
+    assert obj.get_symbol(name) == []
+    assert obj.symbols.get_by_name_and_ordinal(name, ordinal, include_stab=True) == []
+
+
 # Contributed September 2019 by Fraunhofer SIT (https://www.sit.fraunhofer.de/en/).
 def test_dummy():
     """All-in-one testcase exercising all features in combination for 64 bit binaries"""
@@ -179,6 +347,51 @@ def test_dummy():
         assert v == ld.memory[k]
 
 
+def test_pickle():
+    machofile = os.path.join(TEST_BASE, "tests", "x86_64", "fauxware.macho")
+    ld = cle.Loader(machofile, auto_load_libs=False)
+    obj = ld.main_object
+    sym = next(sym for sym in obj.symbols if not sym.is_stab and sym.name)
+    # fill the lookup tables before pickling, they must not be carried over
+    assert sym in obj.get_symbol(sym.name)
+    assert obj.get_symbol_by_address_fuzzy(sym.relative_addr) is not None
+
+    ld_pickled = pickle.loads(pickle.dumps(ld))
+    obj_pickled = ld_pickled.main_object
+    assert obj_pickled._symbol_index is None
+    assert isinstance(obj_pickled.symbols, SymbolList)
+    expected = [(s.name, s.relative_addr) for s in obj.get_symbol(sym.name)]
+    for found in [
+        obj_pickled.get_symbol(sym.name),
+        obj_pickled.symbols.get_by_name_and_ordinal(sym.name, sym.library_ordinal),
+    ]:
+        assert [(s.name, s.relative_addr) for s in found] == expected
+        assert all(s.owner is obj_pickled for s in found)
+    assert obj_pickled.get_symbol_by_address_fuzzy(sym.relative_addr).owner is obj_pickled
+
+
+def test_truncated_section_headers():
+    machofile = os.path.join(TEST_BASE, "tests", "x86_64", "fauxware.macho")
+    with open(machofile, "rb") as f:
+        data = bytearray(f.read())
+
+    # claim more sections for the first segment with sections than its load command has room for
+    ncmds = struct.unpack_from("<I", data, 16)[0]
+    offset = 32
+    for _ in range(ncmds):
+        cmd, size = struct.unpack_from("<II", data, offset)
+        if cmd == 0x19 and struct.unpack_from("<I", data, offset + 64)[0]:  # LC_SEGMENT_64 with sections
+            struct.pack_into("<I", data, offset + 64, 0x10000)
+            break
+        offset += size
+
+    try:
+        cle.Loader(BytesIO(bytes(data)), auto_load_libs=False)
+        assert False, "section headers past the load commands should be rejected"
+    except cle.CLEInvalidBinaryError:
+        pass
+
+
 def test_find_object_containing():
     machofile = os.path.join(TEST_BASE, "tests", "x86_64", "fauxware.macho")
     ld = cle.Loader(machofile, auto_load_libs=False)
@@ -222,11 +435,34 @@ def test_describe_addr():
     assert ld.describe_addr(ld.main_object.entry) == "_main+0x0 in fauxware.macho (0x100000de0)"
 
 
+def test_detect_byteorder():
+    assert MachO._detect_byteorder(struct.unpack("<I", b"\xcf\xfa\xed\xfe")[0]) == "<"
+    assert MachO._detect_byteorder(struct.unpack("<I", b"\xce\xfa\xed\xfe")[0]) == "<"
+    assert MachO._detect_byteorder(struct.unpack("<I", b"\xfe\xed\xfa\xcf")[0]) == ">"
+    assert MachO._detect_byteorder(struct.unpack("<I", b"\xfe\xed\xfa\xce")[0]) == ">"
+    try:
+        MachO._detect_byteorder(struct.unpack("<I", b"\x7fELF")[0])
+        assert False, "ELF magic should not be detected as Mach-O"
+    except cle.CLECompatibilityError:
+        pass
+
+
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
+    test_symbol_name_index()
+    test_get_symbol_case_insensitive()
+    test_get_symbol_prefix()
+    test_get_symbols_matching()
+    test_get_symbols_by_names()
+    test_find_first_symbol()
+    test_get_symbol_by_address_fuzzy()
+    test_symbol_list_invalidation()
     test_dummy()
+    test_pickle()
+    test_truncated_section_headers()
     test_find_object_containing()
     test_addresses()
     test_find_section_containing()
     test_find_region_containing()
     test_describe_addr()
+    test_detect_byteorder()
@@ -8,6 +8,7 @@ import cle
 from cle import CLEInvalidBinaryError, MachO
 from cle.backends.macho.binding import (
     BindingState,
+    decode_uleb_swar,
     n_opcode_done,
     n_opcode_set_addend_sleb,
     n_opcode_set_dylib_ordinal_imm,
@@ -139,6 +140,16 @@ class TestLEB(unittest.TestCase):
         result = read_uleb(buffer, 0)
         self.assertEqual(expected, result)
 
+    def test_decode_uleb_swar(self):
+        padding = b"\x00" * 8
+        self.assertEqual(decode_uleb_swar(b"\xE5\x8E\x26" + padding, 0), (624485, 3))
+        self.assertEqual(decode_uleb_swar(b"\x7F" + padding, 0), (127, 1))
+        self.assertEqual(decode_uleb_swar(b"\x00\x80\x01" + padding, 1), (128, 2))
+        # longer than 8 bytes, uses the fallback
+        buffer = b"\xFF" * 9 + b"\x01" + padding
+        self.assertEqual(decode_uleb_swar(buffer, 0), (2**64 - 1, 10))
+        self.assertEqual(decode_uleb_swar(buffer, 0), read_uleb(buffer, 0))
+
     def test_read_sleb(self):
         # Test vector from wikipedia https://en.wikipedia.org/wiki/LEB128
         buffer = b"\xE5\x8E\x26"